@@ -1,28 +1,82 @@
 import asyncio
+import contextlib
+import functools
 import json
+import logging
 import os
+import random
+import struct
 import time
+from solders.hash import Hash
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from solders.instruction import Instruction, AccountMeta
 from solders.transaction import VersionedTransaction
 from solders.message import MessageV0
+from solders.rpc.config import RpcSendTransactionConfig
+from solders.rpc.requests import SendVersionedTransaction
+from solders.signature import Signature
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Confirmed
 from solana.rpc.types import TxOpts
 from typing import List
 
+try:
+    import base58
+except ImportError:  # only needed for base58-encoded secret keys
+    base58 = None
+
+try:
+    import orjson
+except ImportError:  # optional C-accelerated JSON, fall back to stdlib
+    orjson = None
+
 # -------------------------------------------
 # Config & Global Constants
 # -------------------------------------------
 PROGRAM_ID = Pubkey.from_string("DV88SqFNjehQYUdgezSEYK5Hp4xgx54s7Na4jpmBYKJ9")
 PDA_SEED = b"program_data"
+# Canonical bump for [PDA_SEED] under PROGRAM_ID, as returned by find_program_address;
+# with it the PDA is a single hash. Update together with PROGRAM_ID.
+PROGRAM_DATA_BUMP = 254
+PROGRAM_DATA_PDA = Pubkey.create_program_address([PDA_SEED, bytes([PROGRAM_DATA_BUMP])], PROGRAM_ID)
 SYSTEM_PROGRAM = Pubkey.from_string("11111111111111111111111111111111")
+# Anchor instruction discriminators: sha256("global:<name>")[:8]
+INITIALIZE_DISCRIMINATOR = bytes([175, 175, 109, 31, 13, 152, 155, 237])
+ADD_CLAIM_DISCRIMINATOR = bytes([70, 114, 85, 106, 66, 244, 46, 99])
+GET_CLAIMS_DISCRIMINATOR = bytes([137, 77, 151, 53, 39, 5, 110, 188])
+SYSTEM_PROGRAM_META = AccountMeta(pubkey=SYSTEM_PROGRAM, is_signer=False, is_writable=False)
+PROGRAM_DATA_META = AccountMeta(pubkey=PROGRAM_DATA_PDA, is_signer=False, is_writable=True)
+PROGRAM_DATA_META_READONLY = AccountMeta(pubkey=PROGRAM_DATA_PDA, is_signer=False, is_writable=False)
 DEFAULT_KEYPAIR_PATH = os.environ.get("SOLANA_WALLET", os.path.expanduser("~/.config/solana/id.json"))
 RPC_ENDPOINT = os.environ.get("SOLANA_RPC", "https://api.devnet.solana.com")
+RPC_TIMEOUT = float(os.environ.get("SOLANA_RPC_TIMEOUT", "30"))  # seconds
 MINIMUM_SOL = 0.000005
+CHECK_BALANCE = os.environ.get("CHECK_BALANCE") == "1"  # opt-in preflight balance check
+BALANCE_TTL = 30  # seconds a fetched balance is reused for
 MAX_RETRIES = 3
-RETRY_DELAY = 2  # seconds
+RETRY_DELAY = 2  # seconds, doubled on each retry
+MAX_RETRY_DELAY = 8  # seconds, cap for the exponential backoff
+BLOCKHASH_REFRESH_INTERVAL = 5  # seconds
+SEND_CONCURRENCY = 25  # max add_claim transactions in flight in add_claims_many
+BATCH_SIZE = 100  # max transactions per JSON-RPC batch in add_claims_bulk (providers cap batch size)
+
+logger = logging.getLogger(__name__)
+
+# Shared RPC client, created lazily on first use and reused across calls made on
+# the event loop that created it (_client_loop)
+_client: AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+# Number of open session() blocks; the shared client is closed when the last one exits
+_session_count = 0
+
+# Latest blockhash and the monotonic time it was fetched, kept fresh by a background task
+_blockhash_cache: tuple[Hash, float] | None = None
+_blockhash_task: asyncio.Task | None = None
+
+# Last fetched payer balance as (pubkey, lamports, monotonic fetch time)
+_balance_cache: tuple[Pubkey, int, float] | None = None
 
 # -------------------------------------------
 # Wallet Loading Helpers
@@ -35,30 +89,38 @@ def load_wallet_from_secret(secret: list[int]) -> Keypair:
         raise ValueError(f"Failed to load wallet from secret: {e}")
 
 def read_secret_key_from_file(path: str) -> list[int]:
-    if not os.path.exists(path):
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
         raise FileNotFoundError(f"Secret key file not found: {path}")
-    with open(path, "r") as f:
-        data = f.read()
+    try:
+        secret = json.loads(data)
+        if isinstance(secret, list) and all(isinstance(i, int) for i in secret):
+            return secret
+    except json.JSONDecodeError:
+        if base58 is None:
+            raise RuntimeError("base58 is not installed; cannot decode base58 secret key file")
         try:
-            secret = json.loads(data)
-            if isinstance(secret, list) and all(isinstance(i, int) for i in secret):
-                return secret
-        except json.JSONDecodeError:
-            import base58
-            try:
-                return list(base58.b58decode(data))
-            except Exception as e:
-                raise ValueError(f"Invalid secret key format: {e}")
+            return list(base58.b58decode(data.strip()))
+        except Exception as e:
+            raise ValueError(f"Invalid secret key format: {e}")
     raise ValueError(f"Invalid secret key file: {path}")
 
+@functools.cache
+def load_keypair(path: str) -> Keypair:
+    """Load the Keypair stored at path, deriving it only once per path."""
+    return load_wallet_from_secret(read_secret_key_from_file(path))
+
+@functools.cache
 def load_wallet() -> Keypair:
     try:
-        secret = read_secret_key_from_file(DEFAULT_KEYPAIR_PATH)
-        return load_wallet_from_secret(secret)
+        return load_keypair(DEFAULT_KEYPAIR_PATH)
     except Exception as e:
         secret_b58 = os.environ.get("SOLANA_SECRET_KEY_B58")
         if secret_b58:
-            import base58
+            if base58 is None:
+                raise RuntimeError("base58 is not installed; cannot decode SOLANA_SECRET_KEY_B58")
             try:
                 secret_bytes = base58.b58decode(secret_b58)
                 return Keypair.from_bytes(secret_bytes)
@@ -70,21 +132,51 @@ def load_wallet() -> Keypair:
 # Helper Functions
 # -------------------------------------------
 
+def _json_default(obj):
+    """Encode raw claim fields: byte buffers as hex, Pubkeys as Base58, ClaimViews as their fields."""
+    if isinstance(obj, ClaimView):
+        return obj.to_dict()
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return obj.hex()
+    if isinstance(obj, Pubkey):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_pretty(obj) -> str:
+    """Serialize obj as 2-space indented JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, default=_json_default)
+
 def encode_option_pubkey(pubkey: Pubkey | None) -> bytes:
     """Encode an Option<Pubkey> as 1 byte (Some/None) + 32 bytes (if Some)."""
     if pubkey is None:
         return bytes([0])  # None
     return bytes([1]) + bytes(pubkey)  # Some + pubkey
 
-def encode_string(s: str) -> bytes:
-    """Encode a string as 4-byte length + UTF-8 bytes."""
-    encoded = s.encode("utf-8")
-    return len(encoded).to_bytes(4, "little") + encoded
-
-def get_pda() -> Pubkey:
-    """Derive the PDA for program_data."""
-    pda, _ = Pubkey.find_program_address([PDA_SEED], PROGRAM_ID)
-    return pda
+def check_sol_balance(lamports: int) -> float:
+    """Convert a lamport balance to SOL, raising if it is below MINIMUM_SOL."""
+    sol_balance = lamports / 1_000_000_000
+    if sol_balance < MINIMUM_SOL:
+        raise ValueError(f"Insufficient SOL balance: {sol_balance} SOL")
+    logger.debug("Wallet balance: %s SOL", sol_balance)
+    return sol_balance
+
+def cache_balance(pubkey: Pubkey, lamports: int):
+    """Remember a balance reading so ensure_min_balance() can reuse it for BALANCE_TTL."""
+    global _balance_cache
+    _balance_cache = (pubkey, lamports, time.monotonic())
+
+async def ensure_min_balance(client: AsyncClient, pubkey: Pubkey):
+    """Check pubkey against MINIMUM_SOL when CHECK_BALANCE is set, reusing recent readings."""
+    if not CHECK_BALANCE:
+        return
+    cached = _balance_cache
+    if cached is None or cached[0] != pubkey or time.monotonic() - cached[2] > BALANCE_TTL:
+        balance_resp = await client.get_balance(pubkey)
+        cache_balance(pubkey, balance_resp.value)
+        cached = _balance_cache
+    check_sol_balance(cached[1])
 
 # -------------------------------------------
 # Instruction Construction
@@ -92,312 +184,526 @@ def get_pda() -> Pubkey:
 
 def build_initialize_instruction(creator: Pubkey, initial_owner: Pubkey | None) -> Instruction:
     """Build the initialize instruction."""
-    program_data_pda = get_pda()
-    discriminator = bytes([175, 175, 109, 31, 13, 152, 155, 237])
-    data = discriminator + encode_option_pubkey(initial_owner)
+    data = INITIALIZE_DISCRIMINATOR + encode_option_pubkey(initial_owner)
     accounts: List[AccountMeta] = [
-        AccountMeta(pubkey=program_data_pda, is_signer=False, is_writable=True),
+        PROGRAM_DATA_META,
         AccountMeta(pubkey=creator, is_signer=True, is_writable=True),
-        AccountMeta(pubkey=SYSTEM_PROGRAM, is_signer=False, is_writable=False),
+        SYSTEM_PROGRAM_META,
     ]
     return Instruction(PROGRAM_ID, data, accounts)
 
-def build_add_claim_instruction(creator: Pubkey, claim_id: str, json_url: str, data_hash: bytes) -> Instruction:
+def build_add_claim_instruction(creator: Pubkey, claim_id: str, json_url: str,
+                                data_hash: bytes | bytearray | memoryview) -> Instruction:
     """Build the add_claim instruction."""
-    program_data_pda = get_pda()
-    discriminator = bytes([70, 114, 85, 106, 66, 244, 46, 99])
-    if len(data_hash) != 32:
-        raise ValueError("data_hash must be 32 bytes")
-    data = discriminator + encode_string(claim_id) + encode_string(json_url) + data_hash
+    if not (claim_id and json_url and isinstance(data_hash, (bytes, bytearray, memoryview))
+            and len(data_hash) == 32):
+        raise ValueError("claim_id and json_url must be non-empty and data_hash must be 32 bytes")
+    # Build the payload in one buffer: discriminator | claim_id | json_url | data_hash
+    claim_id_bytes = claim_id.encode("utf-8")
+    json_url_bytes = json_url.encode("utf-8")
+    buf = bytearray(ADD_CLAIM_DISCRIMINATOR)
+    buf += len(claim_id_bytes).to_bytes(4, "little")
+    buf += claim_id_bytes
+    buf += len(json_url_bytes).to_bytes(4, "little")
+    buf += json_url_bytes
+    buf += data_hash
+    data = bytes(buf)
     accounts: List[AccountMeta] = [
-        AccountMeta(pubkey=program_data_pda, is_signer=False, is_writable=True),
+        PROGRAM_DATA_META,
         AccountMeta(pubkey=creator, is_signer=True, is_writable=True),
     ]
     return Instruction(PROGRAM_ID, data, accounts)
 
 def build_get_claims_instruction(requester: Pubkey) -> Instruction:
     """Build the get_claims instruction."""
-    program_data_pda = get_pda()
-    discriminator = bytes([137, 77, 151, 53, 39, 5, 110, 188])
-    data = discriminator
     accounts: List[AccountMeta] = [
-        AccountMeta(pubkey=program_data_pda, is_signer=False, is_writable=False),
+        PROGRAM_DATA_META_READONLY,
         AccountMeta(pubkey=requester, is_signer=True, is_writable=True),
     ]
-    return Instruction(PROGRAM_ID, data, accounts)
+    return Instruction(PROGRAM_ID, GET_CLAIMS_DISCRIMINATOR, accounts)
+
+def build_add_claim_transactions(wallet: Keypair, claims: list[tuple[str, str, bytes]],
+                                 blockhash: Hash) -> list[VersionedTransaction | Exception]:
+    """Sign one add_claim transaction per (claim_id, json_url, data_hash) against blockhash.
+
+    An entry that fails validation gets the raised exception in its slot instead of a transaction.
+    """
+    creator = wallet.pubkey()
+    txs = []
+    for claim_id, json_url, data_hash in claims:
+        try:
+            message = MessageV0.try_compile(
+                payer=creator,
+                instructions=[build_add_claim_instruction(creator, claim_id, json_url, data_hash)],
+                address_lookup_table_accounts=[],
+                recent_blockhash=blockhash,
+            )
+            txs.append(VersionedTransaction(message, [wallet]))
+        except Exception as e:
+            txs.append(e)
+    return txs
 
 # -------------------------------------------
-# Transaction Execution
+# Claim Decoding
 # -------------------------------------------
 
-async def initialize():
-    print("🔧 Running initialize...")
+CLAIM_FIELDS = ("claim_id_hash", "json_url", "data_hash", "creator", "created_at")
+# Borsh little-endian integer layouts used by the program_data account
+U32 = struct.Struct("<I")
+I64 = struct.Struct("<q")
+
+class ClaimView:
+    """A claim backed by slices of the program_data account, decoded on access."""
+
+    # A plain __slots__ class rather than a dataclass: orjson serializes dataclasses
+    # natively (skipping _creator) instead of going through _json_default
+    __slots__ = ("claim_id_hash", "json_url", "data_hash", "_creator", "created_at")
+
+    def __init__(self, claim_id_hash: memoryview, json_url: str, data_hash: memoryview,
+                 creator: memoryview, created_at: int):
+        self.claim_id_hash = claim_id_hash
+        self.json_url = json_url
+        self.data_hash = data_hash
+        self._creator = creator
+        self.created_at = created_at
+
+    def __repr__(self) -> str:
+        return f"ClaimView(json_url={self.json_url!r}, creator={self.creator}, created_at={self.created_at})"
+
+    @property
+    def creator(self) -> Pubkey:
+        return Pubkey(bytes(self._creator))
+
+    def to_dict(self, fields: tuple[str, ...] = CLAIM_FIELDS) -> dict:
+        """Return the requested fields as raw values; dumps_pretty() encodes them."""
+        return {field: getattr(self, field) for field in fields}
+
+# -------------------------------------------
+# RPC Client
+# -------------------------------------------
+
+def _bind_to_running_loop():
+    """Drop loop-bound shared state left over from a different (usually closed) event loop."""
+    global _client, _client_loop, _blockhash_task, _blockhash_cache, _session_count
+    loop = asyncio.get_running_loop()
+    if _client_loop is not loop:
+        # The old client's connections and the old refresher task belong to the
+        # previous loop and can't be used or awaited from this one
+        _client = None
+        _blockhash_task = None
+        _blockhash_cache = None
+        _session_count = 0
+        _client_loop = loop
+
+async def get_client() -> AsyncClient:
+    """Return the shared AsyncClient, creating it on first use in the running event loop."""
+    global _client
+    _bind_to_running_loop()
+    if _client is None:
+        # One client means one pooled httpx session, so the TLS connection
+        # to the RPC node is kept alive and reused by every later call.
+        _client = AsyncClient(RPC_ENDPOINT, commitment=Confirmed, timeout=RPC_TIMEOUT)
+    return _client
+
+async def shutdown():
+    """Stop the blockhash refresher and close the shared AsyncClient, if one was opened."""
+    global _client, _blockhash_task, _blockhash_cache
+    _bind_to_running_loop()
+    task, client = _blockhash_task, _client
+    _blockhash_task = None
+    _blockhash_cache = None
+    _client = None
+    if task is not None:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    if client is not None:
+        await client.close()
+
+@contextlib.asynccontextmanager
+async def session():
+    """Share one RPC client across every call made inside the block, closing it when the last open session exits."""
+    global _session_count
+    client = await get_client()
+    _session_count += 1
     try:
-        client = AsyncClient(RPC_ENDPOINT, commitment=Confirmed)
-        if not await client.is_connected():
-            raise ConnectionError(f"Failed to connect to RPC: {RPC_ENDPOINT}")
-        print(f"Connected to RPC: {RPC_ENDPOINT}")
+        yield client
+    finally:
+        _session_count -= 1
+        # Overlapping (nested or concurrent) sessions share the client, so only the last one closes it
+        if _session_count == 0:
+            await shutdown()
 
-        wallet = load_wallet()
-        creator = wallet.pubkey()
-        print(f"Wallet public key: {creator}")
+# -------------------------------------------
+# Blockhash Cache
+# -------------------------------------------
 
-        balance_resp = await client.get_balance(creator)
-        sol_balance = balance_resp.value / 1_000_000_000
-        if sol_balance < MINIMUM_SOL:
-            raise ValueError(f"Insufficient SOL balance: {sol_balance} SOL")
-        print(f"Wallet balance: {sol_balance} SOL")
+async def refresh_blockhash() -> Hash:
+    """Fetch the latest blockhash from the RPC node and store it in the cache."""
+    global _blockhash_cache
+    client = await get_client()
+    blockhash_resp = await client.get_latest_blockhash(commitment=Confirmed)
+    blockhash = blockhash_resp.value.blockhash
+    _blockhash_cache = (blockhash, time.monotonic())
+    return blockhash
+
+async def _blockhash_updater():
+    while True:
+        await asyncio.sleep(BLOCKHASH_REFRESH_INTERVAL)
+        try:
+            await refresh_blockhash()
+        except Exception as e:
+            logger.warning("Blockhash refresh failed: %s", e)
+
+async def get_cached_blockhash() -> Hash:
+    """Return a recent blockhash, starting the background refresher on first use."""
+    global _blockhash_task
+    _bind_to_running_loop()
+    if _blockhash_task is None or _blockhash_task.done():
+        _blockhash_task = asyncio.create_task(_blockhash_updater())
+    # Fall back to a direct fetch if the cache is empty or the refresher has stalled
+    if _blockhash_cache is None or time.monotonic() - _blockhash_cache[1] > 2 * BLOCKHASH_REFRESH_INTERVAL:
+        return await refresh_blockhash()
+    return _blockhash_cache[0]
 
-        initial_owner = creator
-        instruction = build_initialize_instruction(creator, initial_owner)
-        print(f"PDA: {get_pda()}")
+# -------------------------------------------
+# Transaction Execution
+# -------------------------------------------
 
-        for attempt in range(1, MAX_RETRIES + 1):
-            try:
-                blockhash_resp = await client.get_latest_blockhash()
-                blockhash = blockhash_resp.value.blockhash
-                print(f"Attempt {attempt}: Using blockhash {blockhash}")
-
-                message = MessageV0.try_compile(
-                    payer=creator,
-                    instructions=[instruction],
-                    address_lookup_table_accounts=[],
-                    recent_blockhash=blockhash,
-                )
-                tx = VersionedTransaction(message, [wallet])
-
-                opts = TxOpts(skip_confirmation=False, skip_preflight=True)
-                tx_sig = await client.send_transaction(tx, opts=opts)
-                print(f"✅ initialize() successful. Transaction Signature: {tx_sig.value}")
-                return tx_sig.value
+async def _prepare_send() -> tuple[AsyncClient, Keypair, Hash]:
+    """Return the shared client, the runner wallet and a recent blockhash, checking the balance."""
+    client = await get_client()
+    wallet = load_wallet()
+    logger.debug("Wallet public key: %s", wallet.pubkey())
+
+    # Independent RPCs: run the balance check and blockhash fetch concurrently
+    _, blockhash = await asyncio.gather(ensure_min_balance(client, wallet.pubkey()), get_cached_blockhash())
+    logger.debug("Using blockhash %s", blockhash)
+    return client, wallet, blockhash
+
+async def submit(instructions: list[Instruction]) -> Signature:
+    """Send instructions as one transaction paid and signed by the runner wallet.
+
+    Retries BlockhashNotFound with exponential backoff, refreshing only the blockhash.
+    """
+    client, wallet, blockhash = await _prepare_send()
+    payer = wallet.pubkey()
+    logger.debug("PDA: %s", PROGRAM_DATA_PDA)
+
+    opts = TxOpts(skip_confirmation=False, skip_preflight=True)
+    for attempt in range(1, MAX_RETRIES + 1):
+        logger.debug("Attempt %d: Using blockhash %s", attempt, blockhash)
+        message = MessageV0.try_compile(
+            payer=payer,
+            instructions=instructions,
+            address_lookup_table_accounts=[],
+            recent_blockhash=blockhash,
+        )
+        tx = VersionedTransaction(message, [wallet])
+        try:
+            tx_sig = await client.send_transaction(tx, opts=opts)
+            return tx_sig.value
+        except Exception as e:
+            if "BlockhashNotFound" not in str(e) or attempt == MAX_RETRIES:
+                raise
+            # Exponential backoff with jitter so concurrent senders don't retry in lockstep
+            delay = min(RETRY_DELAY * 2 ** (attempt - 1), MAX_RETRY_DELAY) + random.uniform(0, 0.25)
+            logger.warning("Blockhash not found, retrying in %.2f seconds...", delay)
+            await asyncio.sleep(delay)
+            # Only the blockhash is stale; the instructions and balance check still hold
+            blockhash = await refresh_blockhash()
 
-            except Exception as e:
-                if "BlockhashNotFound" in str(e) and attempt < MAX_RETRIES:
-                    print(f"Blockhash not found, retrying in {RETRY_DELAY} seconds...")
-                    await asyncio.sleep(RETRY_DELAY)
-                    continue
-                raise e
+async def initialize():
+    logger.info("🔧 Running initialize...")
+    try:
+        creator = load_wallet().pubkey()
+        tx_sig = await submit([build_initialize_instruction(creator, creator)])
+        logger.info("✅ initialize() successful. Transaction Signature: %s", tx_sig)
+        return tx_sig
 
     except Exception as e:
-        print(f"❌ initialize() failed: {e}")
+        logger.error("❌ initialize() failed: %s", e)
         raise
-    finally:
-        await client.close()
 
 async def add_claim(claim_id: str, json_url: str, data_hash: bytes):
-    print("🔧 Running add_claim...")
+    logger.info("🔧 Running add_claim...")
     try:
-        client = AsyncClient(RPC_ENDPOINT, commitment=Confirmed)
-        if not await client.is_connected():
-            raise ConnectionError(f"Failed to connect to RPC: {RPC_ENDPOINT}")
-        print(f"Connected to RPC: {RPC_ENDPOINT}")
+        creator = load_wallet().pubkey()
+        tx_sig = await submit([build_add_claim_instruction(creator, claim_id, json_url, data_hash)])
+        logger.info("✅ add_claim() successful. Transaction Signature: %s", tx_sig)
+        return tx_sig
 
-        wallet = load_wallet()
-        creator = wallet.pubkey()
-        print(f"Wallet public key: {creator}")
+    except Exception as e:
+        logger.error("❌ add_claim() failed: %s", e)
+        raise
 
-        balance_resp = await client.get_balance(creator)
-        sol_balance = balance_resp.value / 1_000_000_000
-        if sol_balance < MINIMUM_SOL:
-            raise ValueError(f"Insufficient SOL balance: {sol_balance} SOL")
-        print(f"Wallet balance: {sol_balance} SOL")
+async def initialize_and_add_claim(claim_id: str, json_url: str, data_hash: bytes):
+    """Initialize the program and add its first claim atomically, in one transaction."""
+    logger.info("🔧 Running initialize_and_add_claim...")
+    try:
+        creator = load_wallet().pubkey()
+        tx_sig = await submit([
+            build_initialize_instruction(creator, creator),
+            build_add_claim_instruction(creator, claim_id, json_url, data_hash),
+        ])
+        logger.info("✅ initialize_and_add_claim() successful. Transaction Signature: %s", tx_sig)
+        return tx_sig
 
-        instruction = build_add_claim_instruction(creator, claim_id, json_url, data_hash)
-        print(f"PDA: {get_pda()}")
+    except Exception as e:
+        logger.error("❌ initialize_and_add_claim() failed: %s", e)
+        raise
 
-        for attempt in range(1, MAX_RETRIES + 1):
-            try:
-                blockhash_resp = await client.get_latest_blockhash()
-                blockhash = blockhash_resp.value.blockhash
-                print(f"Attempt {attempt}: Using blockhash {blockhash}")
-
-                message = MessageV0.try_compile(
-                    payer=creator,
-                    instructions=[instruction],
-                    address_lookup_table_accounts=[],
-                    recent_blockhash=blockhash,
-                )
-                tx = VersionedTransaction(message, [wallet])
-
-                opts = TxOpts(skip_confirmation=False, skip_preflight=True)
+async def add_claims_bulk(claims: list[tuple[str, str, bytes]]) -> list:
+    """Submit one add_claim transaction per (claim_id, json_url, data_hash) in JSON-RPC batches of BATCH_SIZE.
+
+    Returns a list aligned with `claims` holding each transaction's Signature, or the
+    exception describing why that entry was rejected. Signatures are submitted, not confirmed.
+    """
+    if not claims:
+        # An empty JSON-RPC batch is itself an invalid request
+        return []
+
+    logger.info("🔧 Running add_claims_bulk for %d claims...", len(claims))
+    try:
+        client, wallet, blockhash = await _prepare_send()
+
+        config = RpcSendTransactionConfig(skip_preflight=True)
+        txs = build_add_claim_transactions(wallet, claims, blockhash)
+        # Entries that failed to build keep their exception; the rest are sent with their index as id
+        requests = [SendVersionedTransaction(tx, config, id=request_id)
+                    for request_id, tx in enumerate(txs) if isinstance(tx, VersionedTransaction)]
+
+        by_id = {}
+        for start in range(0, len(requests), BATCH_SIZE):
+            raw = await client._provider.make_batch_request_unparsed(tuple(requests[start:start + BATCH_SIZE]))
+            responses = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            if not isinstance(responses, list):
+                # The node rejected the batch as a whole (e.g. batching disabled)
+                error = responses.get("error", responses) if isinstance(responses, dict) else responses
+                raise RuntimeError(f"Batch request rejected: {error}")
+            # JSON-RPC does not guarantee batch response order, so match on id
+            by_id.update((resp.get("id"), resp) for resp in responses)
+
+        results = []
+        for request_id, tx in enumerate(txs):
+            resp = by_id.get(request_id)
+            if isinstance(tx, Exception):
+                results.append(tx)
+            elif resp is None:
+                results.append(RuntimeError(f"No response for batch request {request_id}"))
+            elif "error" in resp:
+                results.append(RuntimeError(f"Batch request {request_id} failed: {resp['error']}"))
+            else:
+                results.append(Signature.from_string(resp["result"]))
+        logger.info("✅ add_claims_bulk() submitted %d/%d transactions",
+                    sum(isinstance(r, Signature) for r in results), len(results))
+        return results
+
+    except Exception as e:
+        logger.error("❌ add_claims_bulk() failed: %s", e)
+        raise
+
+async def add_claims_many(claims: list[tuple[str, str, bytes]]) -> list:
+    """Send one add_claim transaction per (claim_id, json_url, data_hash) concurrently.
+
+    At most SEND_CONCURRENCY sends are in flight at once. Returns a list aligned with
+    `claims` holding each confirmed Signature, or the exception raised for that entry.
+    """
+    if not claims:
+        return []
+
+    logger.info("🔧 Running add_claims_many for %d claims...", len(claims))
+    try:
+        client, wallet, blockhash = await _prepare_send()
+        txs = build_add_claim_transactions(wallet, claims, blockhash)
+
+        opts = TxOpts(skip_confirmation=False, skip_preflight=True)
+        semaphore = asyncio.Semaphore(SEND_CONCURRENCY)
+
+        async def send(tx: VersionedTransaction | Exception) -> Signature | Exception:
+            if isinstance(tx, Exception):
+                # Failed validation in build_add_claim_transactions; report it in this entry's slot
+                return tx
+            async with semaphore:
                 tx_sig = await client.send_transaction(tx, opts=opts)
-                print(f"✅ add_claim() successful. Transaction Signature: {tx_sig.value}")
                 return tx_sig.value
 
-            except Exception as e:
-                if "BlockhashNotFound" in str(e) and attempt < MAX_RETRIES:
-                    print(f"Blockhash not found, retrying in {RETRY_DELAY} seconds...")
-                    await asyncio.sleep(RETRY_DELAY)
-                    continue
-                raise e
+        results = await asyncio.gather(*(send(tx) for tx in txs), return_exceptions=True)
+        logger.info("✅ add_claims_many() landed %d/%d transactions",
+                    sum(isinstance(r, Signature) for r in results), len(results))
+        return results
 
     except Exception as e:
-        print(f"❌ add_claim() failed: {e}")
+        logger.error("❌ add_claims_many() failed: %s", e)
         raise
-    finally:
-        await client.close()
 
-async def get_claims():
-    print("🔧 Running get_claims...")
+async def get_claims(fields: tuple[str, ...] | None = CLAIM_FIELDS):
+    """Return claims as dicts limited to `fields`, or as ClaimView objects if `fields` is None.
+
+    Hashes are memoryviews and creator a Pubkey; they are hex/Base58 encoded only by dumps_pretty().
+    """
+    logger.info("🔧 Running get_claims...")
     try:
-        client = AsyncClient(RPC_ENDPOINT, commitment=Confirmed)
-        if not await client.is_connected():
-            raise ConnectionError(f"Failed to connect to RPC: {RPC_ENDPOINT}")
-        print(f"Connected to RPC: {RPC_ENDPOINT}")
+        client = await get_client()
 
         wallet = load_wallet()
         requester = wallet.pubkey()
-        print(f"Wallet public key: {requester}")
+        logger.debug("Wallet public key: %s", requester)
 
-        balance_resp = await client.get_balance(requester)
-        sol_balance = balance_resp.value / 1_000_000_000
-        if sol_balance < MINIMUM_SOL:
-            raise ValueError(f"Insufficient SOL balance: {sol_balance} SOL")
-        print(f"Wallet balance: {sol_balance} SOL")
+        pda = PROGRAM_DATA_PDA
+        logger.debug("PDA: %s", pda)
 
-        pda = get_pda()
-        print(f"PDA: {pda}")
+        # Fetch the wallet and PDA accounts in a single getMultipleAccounts call;
+        # the wallet account gives the balance for free
+        accounts_resp = await client.get_multiple_accounts([requester, pda])
+        wallet_account, pda_account = accounts_resp.value
+
+        if CHECK_BALANCE:
+            lamports = wallet_account.lamports if wallet_account is not None else 0
+            cache_balance(requester, lamports)
+            check_sol_balance(lamports)
 
         # Check if PDA account exists and is initialized
-        account_resp = await client.get_account_info(pda)
-        if account_resp.value is None:
-            print("PDA account not found. Initializing...")
+        if pda_account is None:
+            logger.info("PDA account not found. Initializing...")
             await initialize()
             return []  # Return empty list after initialization
         
-        data = account_resp.value.data
-        print(f"Raw PDA data length: {len(data)} bytes")
-        print(f"Raw PDA data (hex): {data.hex()}")
-        
-        # Print data structure breakdown
-        print("\nData Structure Breakdown:")
-        print("------------------------")
-        offset = 0
-        print(f"0-7:    Program Discriminator: {data[offset:offset+8].hex()}")
-        offset += 8
-        print(f"8-39:   Owner: {Pubkey(data[offset:offset+32])}")
-        offset += 32
-        print(f"40-72:  Pending Owner: {'None' if data[offset] == 0 else Pubkey(data[offset+1:offset+33])}")
-        offset += 33
+        data = pda_account.data
+        view = memoryview(data)
+        data_len = len(data)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        logger.debug("Raw PDA data length: %d bytes", data_len)
+
+        # Hex-dumping the whole account and decoding the header keys is only
+        # worth doing when someone is going to read it
+        if debug:
+            logger.debug("Raw PDA data (hex): %s", data.hex())
+            logger.debug("Data Structure Breakdown:")
+            logger.debug("0-7:    Program Discriminator: %s", data[0:8].hex())
+            logger.debug("8-39:   Owner: %s", Pubkey(data[8:40]))
+            logger.debug("40-72:  Pending Owner: %s", None if data[40] == 0 else Pubkey(data[41:73]))
+        offset = 8 + 32 + 33
 
         # Read number of claims (Anchor Vec length)
-        if offset + 4 > len(data):
-            print("Data too short for number of claims")
+        if offset + 4 > data_len:
+            logger.warning("Data too short for number of claims")
             await initialize()
             return []
-        num_claims = int.from_bytes(data[offset:offset+4], "little")
-        print(f"73-76:  Number of Claims: {num_claims}")
+        num_claims = U32.unpack_from(view, offset)[0]
+        logger.debug("73-76:  Number of Claims: %d", num_claims)
         offset += 4
 
         # Validate number of claims (should be reasonable)
         if num_claims > 1000:  # Arbitrary reasonable limit
-            print(f"Invalid number of claims: {num_claims}")
+            logger.warning("Invalid number of claims: %d", num_claims)
             await initialize()
             return []
 
-        claims = []
-        for i in range(num_claims):
-            print(f"\nProcessing claim {i+1}:")
-            
+        # num_claims is an upper bound: decoding stops early on truncated data
+        claims: list[ClaimView | None] = [None] * num_claims
+        count = 0
+        for _ in range(num_claims):
             # Read claim_id_hash (32 bytes)
-            if offset + 32 > len(data):
-                print("Data too short for claim ID hash")
+            if offset + 32 > data_len:
+                logger.warning("Data too short for claim ID hash")
                 break
-            claim_id_hash = data[offset:offset+32]
-            print(f"Claim ID hash: {claim_id_hash.hex()}")
+            claim_id_hash = view[offset:offset+32]
             offset += 32
 
             # Read json_url (Anchor String)
-            if offset + 4 > len(data):
-                print("Data too short for JSON URL length")
+            if offset + 4 > data_len:
+                logger.warning("Data too short for JSON URL length")
                 break
-            json_url_len = int.from_bytes(data[offset:offset+4], "little")
-            print(f"JSON URL length: {json_url_len}")
+            json_url_len = U32.unpack_from(view, offset)[0]
             offset += 4
 
             # Validate JSON URL length (should be reasonable)
             if json_url_len > 1000:  # Arbitrary reasonable limit
-                print(f"Invalid JSON URL length: {json_url_len}")
+                logger.warning("Invalid JSON URL length: %d", json_url_len)
                 break
 
-            if offset + json_url_len > len(data):
-                print("Data too short for JSON URL")
+            if offset + json_url_len > data_len:
+                logger.warning("Data too short for JSON URL")
                 break
             try:
-                json_url = data[offset:offset+json_url_len].decode("utf-8")
-                print(f"JSON URL: {json_url}")
+                json_url = str(view[offset:offset+json_url_len], "utf-8")
             except UnicodeDecodeError as e:
-                print(f"Failed to decode JSON URL: {e}")
-                print(f"Problematic bytes: {data[offset:offset+json_url_len].hex()}")
-                print("Skipping malformed claim...")
-                offset += json_url_len
+                logger.warning("Failed to decode JSON URL: %s", e)
+                logger.warning("Problematic bytes: %s", view[offset:offset+json_url_len].hex())
+                logger.warning("Skipping malformed claim...")
+                # Step over the URL and the fixed-size data_hash, creator and created_at fields
+                offset += json_url_len + 32 + 32 + 8
                 continue
             offset += json_url_len
 
             # Read data_hash (32 bytes)
-            if offset + 32 > len(data):
-                print("Data too short for data hash")
+            if offset + 32 > data_len:
+                logger.warning("Data too short for data hash")
                 break
-            data_hash = data[offset:offset+32]
+            data_hash = view[offset:offset+32]
             offset += 32
 
             # Read creator (32 bytes)
-            if offset + 32 > len(data):
-                print("Data too short for creator")
+            if offset + 32 > data_len:
+                logger.warning("Data too short for creator")
                 break
-            creator = Pubkey(data[offset:offset+32])
+            creator = view[offset:offset+32]
             offset += 32
 
             # Read created_at (i64, 8 bytes)
-            if offset + 8 > len(data):
-                print("Data too short for created_at")
+            if offset + 8 > data_len:
+                logger.warning("Data too short for created_at")
                 break
-            created_at = int.from_bytes(data[offset:offset+8], "little", signed=True)
+            created_at = I64.unpack_from(view, offset)[0]
             offset += 8
 
-            claims.append({
-                "claim_id_hash": claim_id_hash.hex(),
-                "json_url": json_url,
-                "data_hash": data_hash.hex(),
-                "creator": str(creator),
-                "created_at": created_at
-            })
+            claims[count] = ClaimView(claim_id_hash, json_url, data_hash, creator, created_at)
+            count += 1
+        del claims[count:]
 
-        print(f"Claims: {json.dumps(claims, indent=2)}")
-        return claims
+        if debug:
+            logger.debug("Claims: %s", dumps_pretty([claim.to_dict() for claim in claims]))
+        if fields is None:
+            return claims
+        return [claim.to_dict(fields) for claim in claims]
 
     except Exception as e:
-        print(f"❌ get_claims() failed: {e}")
+        logger.error("❌ get_claims() failed: %s", e)
         raise
-    finally:
-        await client.close()
 
 # -------------------------------------------
 # Entry Point
 # -------------------------------------------
 
 async def main():
-    print("🔥 Starting Solana program interaction")
+    logger.info("🔥 Starting Solana program interaction")
     try:
-        # First, initialize the PDA
-        print("Initializing PDA...")
-        await initialize()
-        
-        # Add a test claim
-        claim_id = "claim_001"
-        json_url = "https://example.com/claim.json"
-        data_hash = bytes([0] * 32)  # Placeholder; use actual hash in production
-        
-        print("Adding test claim...")
-        await add_claim(claim_id, json_url, data_hash)
-        
-        print("Retrieving claims...")
-        claims = await get_claims()
-        print(f"Retrieved claims: {json.dumps(claims, indent=2)}")
-        
+        async with session():
+            # Initialize the PDA and add a test claim in a single transaction
+            claim_id = "claim_001"
+            json_url = "https://example.com/claim.json"
+            data_hash = bytes(32)  # Zero-filled placeholder; use actual hash in production
+
+            logger.info("Initializing PDA and adding test claim...")
+            await initialize_and_add_claim(claim_id, json_url, data_hash)
+
+            logger.info("Retrieving claims...")
+            claims = await get_claims()
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Retrieved claims: %s", dumps_pretty(claims))
+
     except Exception as e:
-        print(f"❌ Main execution failed: {e}")
+        logger.error("❌ Main execution failed: %s", e)
         raise
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Root stays at WARNING so third-party INFO logs (e.g. httpx's per-request lines) stay quiet
+    logging.basicConfig(format="%(message)s")
+    logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+    try:
+        import uvloop
+    except ImportError:  # optional faster event loop, stdlib asyncio otherwise
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file